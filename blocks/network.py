@@ -5,13 +5,16 @@ class Network:
         self.last_departure_time = 0
         self.network_delay = 0.05
         self.packet_loss = 0
+        self.link_rate = self.cfg['bandwidth'] * 1024 # бит/с
+        self.loss_probability = self.cfg['packet_loss_probability']
+        self.jitter_rate = 1.0 / self.cfg['jitter_intensity'] # параметр экспоненциального джиттера
 
     def process_packet(self, packet, current_time):
-        if self.generator.random() < self.cfg['packet_loss_probability']:
+        if self.generator.random() < self.loss_probability:
             self.packet_loss += 1
             return None
 
-        transmission_delay = (packet.size_bytes * 8) / (self.cfg['bandwidth'] * 1024)
+        transmission_delay = (packet.size_bytes * 8) / self.link_rate
         
         arrival_at_router = max(current_time, self.last_departure_time)
         wait_in_queue = arrival_at_router - current_time
@@ -20,12 +23,12 @@ class Network:
             self.packet_loss += 1
             return None
 
-        jitter = self.generator.expovariate(1.0 / self.cfg['jitter_intensity'])
+        jitter = self.generator.expovariate(self.jitter_rate)
         
-        delivery_time = arrival_at_router + transmission_delay + self.network_delay + jitter
-        self.last_departure_time = arrival_at_router + transmission_delay
+        departure_time = arrival_at_router + transmission_delay
+        self.last_departure_time = departure_time
         
-        packet.arrival_time = delivery_time
+        packet.arrival_time = departure_time + self.network_delay + jitter
         return packet
     
     def get_packet_loss(self):
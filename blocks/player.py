@@ -1,9 +1,13 @@
+from bisect import insort
+from collections import deque
+
 class Player:
     def __init__(self, config):
         self.cfg = config
-        self.video_buffer = [] # Список пакетов (отсортирован по PTS)
-        self.audio_buffer = []
+        self.video_buffer = deque() # PTS принятых пакетов (отсортированы по возрастанию)
+        self.audio_buffer = deque()
         self.av_sync_threshold = 40
+        self.av_sync_threshold_s = self.av_sync_threshold / 1000.0 # порог рассинхрона в секундах
         self.initial_buffer_duration = 2.0
         self.clock = 0
         self.is_stalled = True
@@ -12,46 +16,53 @@ class Player:
 
     def add_packet(self, packet):
         target_buffer = self.video_buffer if packet.type == 'video' else self.audio_buffer
-        target_buffer.append(packet)
-        target_buffer.sort(key=lambda p: p.pts)
+        pts = packet.pts
+        # Пакеты почти всегда приходят по порядку PTS: вставка бинарным поиском
+        # нужна только для переупорядоченных джиттером
+        if not target_buffer or target_buffer[-1] <= pts:
+            target_buffer.append(pts)
+        else:
+            insort(target_buffer, pts)
 
     def get_buffer_level(self):
         if not self.video_buffer: return 0
-        return self.video_buffer[-1].pts - self.clock
+        return self.video_buffer[-1] - self.clock
+
+    def _pop_ready(self, buffer):
+        """Извлекает из начала буфера все пакеты с PTS <= clock, возвращает последний PTS"""
+        last_pts = None
+        clock = self.clock
+        while buffer and buffer[0] <= clock:
+            last_pts = buffer.popleft()
+        return last_pts
 
     def update(self, dt):
         if self.is_stalled:
             if self.get_buffer_level() >= self.initial_buffer_duration:
                 self.is_stalled = False
                 if self.video_buffer:
-                    self.clock = self.video_buffer[0].pts
-                return "playing" 
+                    self.clock = self.video_buffer[0]
+                return "playing"
             else:
                 return "stalling"
 
         self.clock += dt
-        
-        video_ready = [p for p in self.video_buffer if p.pts <= self.clock]
-        audio_ready = [p for p in self.audio_buffer if p.pts <= self.clock]
 
-        if not video_ready and not audio_ready:
+        video_pts = self._pop_ready(self.video_buffer)
+        audio_pts = self._pop_ready(self.audio_buffer)
+
+        if video_pts is None and audio_pts is None:
             self.is_stalled = True
             return "stall_started"
 
-        current_v_pts = self.last_video_pts
-        if video_ready:
-            current_v_pts = video_ready[-1].pts
-            self.video_buffer = [p for p in self.video_buffer if p.pts > current_v_pts]
-            self.last_video_pts = current_v_pts
+        if video_pts is not None:
+            self.last_video_pts = video_pts
 
-        current_a_pts = self.last_audio_pts
-        if audio_ready:
-            current_a_pts = audio_ready[-1].pts
-            self.audio_buffer = [p for p in self.audio_buffer if p.pts > current_a_pts]
-            self.last_audio_pts = current_a_pts
+        if audio_pts is not None:
+            self.last_audio_pts = audio_pts
 
-        sync_diff = abs(current_v_pts - current_a_pts)
-        if sync_diff > (self.av_sync_threshold / 1000.0):
+        sync_diff = abs(self.last_video_pts - self.last_audio_pts)
+        if sync_diff > self.av_sync_threshold_s:
             return ("sync_error", sync_diff)
-            
-        return "playing" 
\ No newline at end of file
+
+        return "playing"
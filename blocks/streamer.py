@@ -9,45 +9,52 @@ class Streamer:
         self.audio_bitrate = 160
         self.frame_count = 0
         self.packet_count = 0
-        
+
+        # Параметры распределений размеров кадров не меняются в ходе симуляции
+        self.gop_size = self.cfg['gop_size']
+        frame_bytes = self.cfg['video_bitrate'] / self.fps / 8
+        self.key_frame_scale = frame_bytes * 1024
+        self.p_frame_mean = frame_bytes * 1024 / 6
+        self.p_frame_sigma = self.p_frame_mean * 0.2
+
+        duration = 0.01
+        mean_size = (self.audio_bitrate * 1000 * duration) / 8
+        variation = 0.1
+        self.audio_min_size = mean_size * (1 - variation)
+        self.audio_max_size = mean_size * (1 + variation)
+
     def generate_video_frame(self, current_time):
-        is_key = (self.frame_count % self.cfg['gop_size']) == 0
+        is_key = (self.frame_count % self.gop_size) == 0
         self.frame_count += 1
         
         if is_key:
             # Распределение Парето для тяжелых I-кадров
-            size = (self.generator.paretovariate(2.5) + 1) * (self.cfg['video_bitrate'] / self.fps / 8) * 1024
+            size = (self.generator.paretovariate(2.5) + 1) * self.key_frame_scale
         else:
             # Нормальное распределение для P-кадров
-            mean_size = self.cfg['video_bitrate'] / self.fps / 8 * 1024 / 6
-            size = max(512, self.generator.gauss(mean_size, mean_size * 0.2))
+            size = max(512, self.generator.gauss(self.p_frame_mean, self.p_frame_sigma))
         frame = Frame('video', current_time, size, is_key)    
         return frame
     
     def generate_audio_frame(self, current_time):
-        duration = 0.01 
-        mean_size = (self.audio_bitrate * 1000 * duration) / 8
-        
-        variation = 0.1
-        min_size = mean_size * (1 - variation)
-        max_size = mean_size * (1 + variation)
-        
-        size = self.generator.uniform(min_size, max_size)
+        size = self.generator.uniform(self.audio_min_size, self.audio_max_size)
         frame = Frame('audio', current_time, size)
         
         return frame
 
     def fragment_into_packets(self, frame, send_time):
         mtu = 1500
+        full_count, tail_size = divmod(frame.size, mtu)
+        sizes = [mtu] * int(full_count)
+        if tail_size > 0:
+            sizes.append(tail_size)
+
         packets = []
-        remaining = frame.size
-        
-        while remaining > 0:
-            p_size = min(remaining, mtu)
-            packets.append(Packet(frame.type, frame.pts, p_size, send_time))
-            self.packet_count += 1
-            remaining -= p_size
-            send_time += 0.001 
+        frame_type, pts = frame.type, frame.pts
+        for p_size in sizes:
+            packets.append(Packet(frame_type, pts, p_size, send_time))
+            send_time += 0.001
+        self.packet_count += len(packets)
         return packets
     
     def get_frame_count(self):
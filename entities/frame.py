@@ -1,6 +1,8 @@
 class Frame:
+    __slots__ = ('type', 'pts', 'size', 'is_keyframe')
+
     def __init__(self, type, pts, size, is_keyframe=False):
         self.type = type  # 'video' или 'audio'
         self.pts = pts    # Presentation Time Stamp (секунды)
         self.size = size
-        self.is_keyframe = is_keyframe
\ No newline at end of file
+        self.is_keyframe = is_keyframe
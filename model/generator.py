@@ -1,6 +1,8 @@
 import math
 import time
 
+TWO_PI = 2.0 * math.pi
+
 class MersenneTwister:
     def __init__(self, seed_value=None):
         self.w, self.n, self.m, self.r = 32, 624, 397, 31
@@ -12,6 +14,7 @@ class MersenneTwister:
         self.f = 1812433253
         
         self.MT = [0] * self.n
+        self.outputs = [] # Готовые числа [0.0, 1.0) для текущего состояния
         self.index = self.n + 1
         self.lower_mask = (1 << self.r) - 1
         self.upper_mask = (~self.lower_mask) & 0xFFFFFFFF
@@ -26,27 +29,44 @@ class MersenneTwister:
 
     def _twist(self):
         """Перемешивание состояния (Twist)"""
-        for i in range(self.n):
-            x = (self.MT[i] & self.upper_mask) + (self.MT[(i + 1) % self.n] & self.lower_mask)
-            xA = x >> 1
-            if x % 2 != 0:
-                xA = xA ^ self.a
-            self.MT[i] = self.MT[(i + self.m) % self.n] ^ xA
+        MT = self.MT
+        n, m = self.n, self.m
+        upper_mask, lower_mask = self.upper_mask, self.lower_mask
+        mag01 = (0, self.a)
+
+        # Цикл разбит на участки, чтобы обойтись без взятия индексов по модулю n
+        for i in range(n - m):
+            x = (MT[i] & upper_mask) | (MT[i + 1] & lower_mask)
+            MT[i] = MT[i + m] ^ (x >> 1) ^ mag01[x & 1]
+        for i in range(n - m, n - 1):
+            x = (MT[i] & upper_mask) | (MT[i + 1] & lower_mask)
+            MT[i] = MT[i + m - n] ^ (x >> 1) ^ mag01[x & 1]
+        x = (MT[n - 1] & upper_mask) | (MT[0] & lower_mask)
+        MT[n - 1] = MT[m - 1] ^ (x >> 1) ^ mag01[x & 1]
         self.index = 0
 
+    def _temper(self):
+        """Закалка (Tempering) сразу всего состояния в пакет чисел [0.0, 1.0)"""
+        u, d, s, b = self.u, self.d, self.s, self.b
+        t, c, l = self.t, self.c, self.l
+        outputs = []
+        for y in self.MT:
+            y ^= (y >> u) & d
+            y ^= (y << s) & b
+            y ^= (y << t) & c
+            y ^= (y >> l)
+            outputs.append((y & 0xFFFFFFFF) / 4294967296.0)
+        self.outputs = outputs
+
     def random(self):
         """Базовый генератор [0.0, 1.0)"""
         if self.index >= self.n:
             self._twist()
+            self._temper()
 
-        y = self.MT[self.index]
-        y ^= (y >> self.u) & self.d
-        y ^= (y << self.s) & self.b
-        y ^= (y << self.t) & self.c
-        y ^= (y >> self.l)
-        
+        value = self.outputs[self.index]
         self.index += 1
-        return (y & 0xFFFFFFFF) / 4294967296.0
+        return value
 
     def uniform(self, a, b):
         """Равномерное распределение для аудио"""
@@ -67,5 +87,5 @@ class MersenneTwister:
         u2 = self.random()
         if u1 <= 0.0: u1 = 1e-9 
         
-        z0 = math.sqrt(-2.0 * math.log(u1)) * math.cos(2.0 * math.pi * u2)
+        z0 = math.sqrt(-2.0 * math.log(u1)) * math.cos(TWO_PI * u2)
         return mu + z0 * sigma
\ No newline at end of file
@@ -1,67 +1,123 @@
 import heapq
+from concurrent.futures import ProcessPoolExecutor
 from blocks.streamer import Streamer
 from blocks.network import Network
 from blocks.player import Player
 from model.statistics_collector import StatisticsCollector
 from model.generator import MersenneTwister
 
+# Типы событий
+GEN_VIDEO, GEN_AUDIO, NETWORK_INGRESS, PLAYER_RECV = range(4)
+
 class Simulation:
-    def __init__(self, config):
+    def __init__(self, config, keep_timeline=True):
         self.events = [] 
         self.config = config
-        self.generator = MersenneTwister()
+        self.generator = MersenneTwister(config.get('random_seed'))
         self.streamer = Streamer(config, self.generator)
         self.network = Network(config, self.generator)
         self.player = Player(config)
-        self.stats = StatisticsCollector()
+        self.stats = StatisticsCollector(keep_timeline)
         self.fps = 60
+        self.tick = 0.01
         self.curr_time = 0
         self.counter = 0
 
     def add_event(self, time, event_type, data=None):
-        heapq.heappush(self.events, (time, self.counter, event_type, data))
+        # Тип события хранится в младших битах порядкового номера: при равном времени
+        # события по-прежнему упорядочены по моменту добавления
+        heapq.heappush(self.events, (time, self.counter << 2 | event_type, data))
         self.counter += 1
 
     def run(self, duration):
-        self.add_event(0, "gen_video")
-        self.add_event(0, "gen_audio")
-        self.add_event(0, "player_tick")
+        # Генерация кадров и такт плеера строго периодичны, поэтому не проходят через
+        # очередь событий: в ней остаются только пакеты в сети. Такты плеера до времени
+        # очередного события выполняются перед его обработкой
+        next_video = next_audio = next_tick = 0
+        # Моменты периодических событий считаются от целых номеров, а не накоплением
+        # суммы периодов, чтобы ошибка округления не росла на длинных симуляциях
+        video_index = audio_index = tick_index = 0
 
-        while self.events and self.curr_time < duration:
-            time, _, etype, data = heapq.heappop(self.events) 
-            self.curr_time = time
-            
-            if etype == "gen_video":
-                frame = self.streamer.generate_video_frame(time)
-                pkts = self.streamer.fragment_into_packets(frame, time)
-                for p in pkts:
-                    self.add_event(p.send_time, "network_ingress", p)
-                self.add_event(time + 1/self.fps, "gen_video")
-
-            elif etype == "gen_audio":
-                frame = self.streamer.generate_audio_frame(time)
-                pkts = self.streamer.fragment_into_packets(frame, time)
-                for p in pkts:
-                    self.add_event(p.send_time, "network_ingress", p)
-                self.add_event(time + 0.01, "gen_audio")
-
-            elif etype == "network_ingress":
-                delivered_pkt = self.network.process_packet(data, time)
-                if delivered_pkt:
-                    self.add_event(delivered_pkt.arrival_time, "player_recv", delivered_pkt)
+        # Обработка такта плеера выполняется прямо в цикле по заранее связанным методам
+        tick = self.tick
+        player_update = self.player.update
+        get_buffer_level = self.player.get_buffer_level
+        collect = self.stats.collect
+        add_sync_error = self.stats.add_sync_error
+
+        # Остальные методы и очередь событий также связываются с локальными именами
+        events = self.events
+        heappush, heappop = heapq.heappush, heapq.heappop
+        counter = self.counter
+        generate_video_frame = self.streamer.generate_video_frame
+        generate_audio_frame = self.streamer.generate_audio_frame
+        fragment_into_packets = self.streamer.fragment_into_packets
+        process_packet = self.network.process_packet
+        add_packet = self.player.add_packet
+        curr_time = self.curr_time
 
-            elif etype == "player_recv":
-                self.player.add_packet(data)
+        while curr_time < duration:
+            time = events[0][0] if events else float('inf')
+            if next_video <= time and next_video <= next_audio:
+                time, etype = next_video, GEN_VIDEO
+            elif next_audio <= time:
+                time, etype = next_audio, GEN_AUDIO
+            else:
+                time, key, data = heappop(events)
+                etype = key & 3
 
-            elif etype == "player_tick":
-                res = self.player.update(0.01)
-        
-                self.stats.collect(time, self.player.get_buffer_level(), res)
-                
+            while next_tick < time:
+                res = player_update(tick)
+                collect(next_tick, get_buffer_level(), res)
                 if isinstance(res, tuple) and res[0] == "sync_error":
-                    self.stats.add_sync_error(time, res[1])   
-                self.add_event(time + 0.01, "player_tick")
+                    add_sync_error(next_tick, res[1])
+                tick_index += 1
+                next_tick = tick_index * tick
+            curr_time = time
+            
+            if etype == PLAYER_RECV:
+                add_packet(data)
+
+            elif etype == NETWORK_INGRESS:
+                delivered_pkt = process_packet(data, time)
+                if delivered_pkt:
+                    heappush(events, (delivered_pkt.arrival_time, counter << 2 | PLAYER_RECV, delivered_pkt))
+                    counter += 1
 
+            else:
+                if etype == GEN_VIDEO:
+                    frame = generate_video_frame(time)
+                    video_index += 1
+                    next_video = video_index / self.fps
+                else:
+                    frame = generate_audio_frame(time)
+                    audio_index += 1
+                    next_audio = audio_index * 0.01
+                for p in fragment_into_packets(frame, time):
+                    heappush(events, (p.send_time, counter << 2 | NETWORK_INGRESS, p))
+                    counter += 1
+
+        self.curr_time = curr_time
+        self.counter = counter
         self.stats.set_packet_count(self.streamer.get_packet_count())     
         self.stats.set_packet_loss(self.network.get_packet_loss())
-        self.stats.print_report()
\ No newline at end of file
+        self.stats.print_report()
+
+
+def _run_replica(config, duration, keep_timeline):
+    sim = Simulation(config, keep_timeline)
+    sim.run(duration)
+    return sim.stats
+
+
+def run_ensemble(config, duration, seeds, n_jobs=None, keep_timeline=True):
+    """Прогоны одной конфигурации с разными зёрнами генератора в параллельных процессах.
+    Возвращает статистику прогонов в порядке seeds. Если нужны только итоговые показатели,
+    keep_timeline=False отключает сохранение потактовых рядов"""
+    configs = [dict(config, random_seed=seed) for seed in seeds]
+    if n_jobs == 1:
+        return [_run_replica(cfg, duration, keep_timeline) for cfg in configs]
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        n = len(configs)
+        return list(executor.map(_run_replica, configs, [duration] * n, [keep_timeline] * n))
@@ -1,9 +1,21 @@
+import sys
+from array import array
+
 class StatisticsCollector:
-    def __init__(self):
-        self.timestamps = []
-        self.buffer_levels = []
-        self.stalls = []           # Список длительностей каждого рывка
-        self.sync_errors = []      # Список величин рассинхрона (в сек)
+    def __init__(self, keep_timeline=True):
+        self.keep_timeline = keep_timeline # Сохранять ли потактовые ряды времени и уровня буфера
+        # Потактовые ряды хранятся в непрерывных массивах чисел, а не в списках объектов float.
+        # Для величин хватает одинарной точности, время остаётся в двойной
+        self.timestamps = array('d')
+        self.buffer_levels = array('f')
+        self.stalls = array('f')           # Длительности каждого рывка
+        self.sync_errors = array('f')      # Величины рассинхрона (в сек)
+        self.sample_count = 0      # Число тактов и время последнего из них
+        self.last_time = 0
+        self.buffer_level_sum = 0  # Накопленные сумма и максимум уровня буфера для отчёта
+        self.max_buffer_level = 0
+        self.sync_error_sum = 0    # Накопленные сумма и максимум рассинхрона для отчёта
+        self.max_sync_error = 0
         self.packet_loss = 0
         self.packet_count = 0
         
@@ -12,8 +24,14 @@ class StatisticsCollector:
         self.stall_start_time = 0
 
     def collect(self, time, buffer_lvl, status):
-        self.timestamps.append(time)
-        self.buffer_levels.append(buffer_lvl)
+        if self.keep_timeline:
+            self.timestamps.append(time)
+            self.buffer_levels.append(buffer_lvl)
+        self.sample_count += 1
+        self.last_time = time
+        self.buffer_level_sum += buffer_lvl
+        if buffer_lvl > self.max_buffer_level:
+            self.max_buffer_level = buffer_lvl
         
         if status == "stalling" or status == "stall_started":
             if not self.is_currently_stalling:
@@ -29,6 +47,9 @@ class StatisticsCollector:
 
     def add_sync_error(self, time, diff):
         self.sync_errors.append(diff)
+        self.sync_error_sum += diff
+        if diff > self.max_sync_error:
+            self.max_sync_error = diff
 
     def set_packet_loss(self, count):
         self.packet_loss += count
@@ -37,40 +58,44 @@ class StatisticsCollector:
         self.packet_count = count
 
     def print_report(self):
-        duration = self.timestamps[-1] if self.timestamps else 0
+        duration = self.last_time
         stall_count = len(self.stalls)
-        avg_stall_duration = (sum(self.stalls) / stall_count) if stall_count > 0 else 0
-        avg_buffer = sum(self.buffer_levels) / len(self.buffer_levels) if self.buffer_levels else 0
+        avg_stall_duration = (self.total_stall_time / stall_count) if stall_count > 0 else 0
+        avg_buffer = self.buffer_level_sum / self.sample_count if self.sample_count else 0
         stall_ratio = (self.total_stall_time / duration * 100) if duration > 0 else 0
         
-        max_sync = max(self.sync_errors) * 1000 if self.sync_errors else 0
-        avg_sync = (sum(self.sync_errors) / len(self.sync_errors) * 1000) if self.sync_errors else 0
+        max_sync = self.max_sync_error * 1000
+        avg_sync = (self.sync_error_sum / len(self.sync_errors) * 1000) if self.sync_errors else 0
 
-        print("\n" + "_"*40)
-        print(" Отчёт имитационной модели Twitch ")
-        print("_"*40)
-        
-        print(f"Общее время симуляции:    {duration:.2f} сек")
-        print(f"Макс. уровень буфера:    {max(self.buffer_levels):.2f} сек")
-        print(f"Средний уровень буфера:   {avg_buffer:.2f} сек")
-        
-        print("_" * 40)
-        print(f"Количество рывков (Stalls): {stall_count}")
-        print(f"Общее время ожидания:      {self.total_stall_time:.2f} сек")
-        print(f"Stall Ratio (простой):     {stall_ratio:.2f}%")
-        print(f"Средняя длительность рывка: {avg_stall_duration:.2f} сек")
-        
-        print("_" * 40)
+        # Отчёт собирается целиком и выводится одной записью в stdout
+        lines = [
+            "\n" + "_"*40,
+            " Отчёт имитационной модели Twitch ",
+            "_"*40,
 
-        print(f"Общее количество пакетов: {self.packet_count}")
-        print(f"Потеря пакетов: {self.packet_loss}")
-        print(f"Процент потерь: {self.packet_loss / self.packet_count * 100:.2f}%" if self.packet_count > 0 else "N/A")
-        print(f"Синхронизация (A/V Sync):")
+            f"Общее время симуляции:    {duration:.2f} сек",
+            f"Макс. уровень буфера:    {self.max_buffer_level:.2f} сек",
+            f"Средний уровень буфера:   {avg_buffer:.2f} сек",
+
+            "_" * 40,
+            f"Количество рывков (Stalls): {stall_count}",
+            f"Общее время ожидания:      {self.total_stall_time:.2f} сек",
+            f"Stall Ratio (простой):     {stall_ratio:.2f}%",
+            f"Средняя длительность рывка: {avg_stall_duration:.2f} сек",
+
+            "_" * 40,
+
+            f"Общее количество пакетов: {self.packet_count}",
+            f"Потеря пакетов: {self.packet_loss}",
+            f"Процент потерь: {self.packet_loss / self.packet_count * 100:.2f}%" if self.packet_count > 0 else "N/A",
+            f"Синхронизация (A/V Sync):",
+        ]
         if self.sync_errors:
-            print(f"  - Макс. рассинхрон:      {max_sync:.2f} мс")
-            print(f"  - Средний рассинхрон:    {avg_sync:.2f} мс")
-            print(f"  - Кол-во ошибок синхронизации: {len(self.sync_errors)}")
+            lines.append(f"  - Макс. рассинхрон:      {max_sync:.2f} мс")
+            lines.append(f"  - Средний рассинхрон:    {avg_sync:.2f} мс")
+            lines.append(f"  - Кол-во ошибок синхронизации: {len(self.sync_errors)}")
         else:
-            print("  - Ошибок синхронизации не выявлено")
-            
-        print('\n')
\ No newline at end of file
+            lines.append("  - Ошибок синхронизации не выявлено")
+
+        lines.append('\n')
+        sys.stdout.write("\n".join(lines) + "\n")
@@ -1,4 +1,5 @@
 import os
+from itertools import chain
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy import stats
@@ -10,13 +11,18 @@ class SimulationAnalyzer:
     def save_run(self, stats_collector):
         run_results = {
             'buffer_levels': stats_collector.buffer_levels,
-            'avg_stall_duration': np.mean(stats_collector.stalls) if stats_collector.stalls else 0,
+            'avg_stall_duration': stats_collector.total_stall_time / len(stats_collector.stalls) if stats_collector.stalls else 0,
             'packet_count': stats_collector.packet_count,
             'packet_loss': stats_collector.packet_loss,
             'sync_errors': [err * 1000 for err in stats_collector.sync_errors],
+            'total_sync_error': stats_collector.sync_error_sum * 1000,
             'total_stall_time': stats_collector.total_stall_time
         }
         self.runs_data.append(run_results)
+
+    def _flatten(self, key):
+        """Объединяет ряды значений метрики key всех прогонов в один список"""
+        return list(chain.from_iterable(run[key] for run in self.runs_data))
     
     def _test_and_calculate(self, data, metric_name, f):
         """Проводит тесты и рассчитывает параметры на основе лучшего распределения"""
@@ -73,9 +79,9 @@ class SimulationAnalyzer:
         full_path = os.path.join('results\\stats', filename)
 
         metrics = {
-            "Ошибки синхронизации (ms)": [err for r in self.runs_data for err in r['sync_errors']],
-            "Уровни буфера (s)": [lvl for r in self.runs_data for lvl in r['buffer_levels']],
-            "Длительность рывков (ms)": [r['avg_stall_duration'] for r in self.runs_data]
+            "Ошибки синхронизации (ms)": self._flatten('sync_errors'),
+            "Уровни буфера (s)": self._flatten('buffer_levels'),
+            "Длительность рывков (s)": [r['avg_stall_duration'] for r in self.runs_data]
         }
 
         with open(full_path, 'w', encoding='utf-8') as f:
@@ -95,7 +101,7 @@ class SimulationAnalyzer:
 
         metrics_to_plot = {
             'sync_errors': {
-                'data': [err for r in self.runs_data for err in r['sync_errors']],
+                'data': self._flatten('sync_errors'),
                 'title': 'Распределение ошибок синхронизации',
                 'xlabel': 'Задержка (мс)',
                 'color': 'skyblue'
@@ -107,7 +113,7 @@ class SimulationAnalyzer:
                 'color': 'salmon'
             },
             'buffer_levels': {
-                'data': [lvl for r in self.runs_data for lvl in r['buffer_levels']],
+                'data': self._flatten('buffer_levels'),
                 'title': 'Распределение уровня буфера',
                 'xlabel': 'Уровень заполнености (с)',
                 'color': 'lightgreen'
@@ -146,10 +152,14 @@ class SimulationAnalyzer:
         if not self.runs_data:
             return 0.0, 0.0
             
-        avg_stall = sum(run['total_stall_time'] for run in self.runs_data) / len(self.runs_data)
-        
-        total_sync_per_run = [sum(run['sync_errors']) for run in self.runs_data]
-        avg_sync = sum(total_sync_per_run) / len(self.runs_data)
+        # Суммарные показатели каждого прогона накоплены ещё при сборе статистики
+        total_stall = total_sync = 0
+        for run in self.runs_data:
+            total_stall += run['total_stall_time']
+            total_sync += run['total_sync_error']
+
+        avg_stall = total_stall / len(self.runs_data)
+        avg_sync = total_sync / len(self.runs_data)
         
         return avg_stall, avg_sync
 
@@ -1,14 +1,15 @@
 import random
 import copy
 import numpy as np
-from model.simulator import Simulation
+from model.simulator import run_ensemble
 from stats.analyze import SimulationAnalyzer
 from stats.sensitivity_analyzer import SensitivityAnalyzer
 
 class SimulationOptimizer:
-    def __init__(self, base_config, evaluator):
+    def __init__(self, base_config, evaluator, n_jobs=None):
         self.base_config = base_config
         self.evaluator = evaluator
+        self.n_jobs = n_jobs # Число процессов для повторных прогонов (None - по числу ядер)
         self.history = []
         self.plotter = SensitivityAnalyzer(base_config)
 
@@ -35,11 +36,9 @@ class SimulationOptimizer:
             valid_tested += 1
             print(f"[{valid_tested}/{num_combinations}] Тест: V={config['video_bitrate']}, B={config['bandwidth']}, G={config['gop_size']}, J={config['jitter_intensity']:.4f}, P={config['packet_loss_probability']:.3f}")
 
-            for _ in range(runs_per_combination):
-                config['random_seed'] = random.randint(1, 100000)
-                sim = Simulation(config)
-                sim.run(sim_duration)
-                analyzer.save_run(sim.stats)
+            seeds = [random.randint(1, 100000) for _ in range(runs_per_combination)]
+            for run_stats in run_ensemble(config, sim_duration, seeds, self.n_jobs, keep_timeline=False):
+                analyzer.save_run(run_stats)
             
             avg_stall, avg_sync = analyzer.get_average_metrics()
             qoe_score = self.evaluator.calculate(config['video_bitrate'], avg_stall, avg_sync)
@@ -72,11 +71,9 @@ class SimulationOptimizer:
                     continue
                     
                 analyzer = SimulationAnalyzer()
-                for _ in range(runs_per_point):
-                    cfg['random_seed'] = random.randint(1, 100000)
-                    sim = Simulation(cfg)
-                    sim.run(sim_duration)
-                    analyzer.save_run(sim.stats)
+                seeds = [random.randint(1, 100000) for _ in range(runs_per_point)]
+                for run_stats in run_ensemble(cfg, sim_duration, seeds, self.n_jobs, keep_timeline=False):
+                    analyzer.save_run(run_stats)
                 
                 avg_stall, avg_sync = analyzer.get_average_metrics()
                 qoe = self.evaluator.calculate(cfg['video_bitrate'], avg_stall, avg_sync)
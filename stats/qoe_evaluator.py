@@ -6,6 +6,7 @@ class QoEEvaluator:
         self.beta = beta     # Штраф в % за рывки
         self.gamma = gamma   # Штраф в % за рассинхрон
         self.v_max = 7000    # Максимальный исследуемый битрейт для нормализации
+        self.log_v_max = math.log(self.v_max)
 
     def check_constraints(self, config):
         V = config.get('video_bitrate', 0)
@@ -25,7 +26,7 @@ class QoEEvaluator:
     def calculate(self, bitrate, total_stall, total_sync_error):
         if bitrate <= 0: return float('-inf')
 
-        quality_base = self.alpha * (math.log(bitrate) / math.log(self.v_max))
+        quality_base = self.alpha * (math.log(bitrate) / self.log_v_max)
         stall_penalty = self.beta * total_stall
         sync_penalty = self.gamma * total_sync_error / 1000
         
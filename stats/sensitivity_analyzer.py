@@ -1,15 +1,17 @@
 import os
+import random
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 import seaborn as sns
 from datetime import datetime
-from model.simulator import Simulation
+from model.simulator import run_ensemble
 
 class SensitivityAnalyzer:
-    def __init__(self, base_config):
+    def __init__(self, base_config, n_jobs=None):
         self.base_config = base_config
         self.results = {}
+        self.n_jobs = n_jobs # Число процессов для повторных прогонов (None - по числу ядер)
 
     def run_sensitivity_test(self, param_name, values, iterations_per_step=10):
         print(f"Запуск анализа чувствительности для параметра: {param_name}")
@@ -26,15 +28,14 @@ class SensitivityAnalyzer:
                 'sync_count': []
             }
 
-            for i in range(iterations_per_step):
-                sim = Simulation(current_config)
-                sim.run(3000)
-                
-                run_metrics['avg_buffer'].append(np.mean(sim.stats.buffer_levels))
-                run_metrics['total_stall_time'].append(sim.stats.total_stall_time)
-                sync_errs = [abs(e) * 1000 for e in sim.stats.sync_errors]
-                run_metrics['avg_sync'].append(np.mean(sync_errs) if sync_errs else 0)
-                run_metrics['sync_count'].append(len(sync_errs))
+            seeds = [random.randint(1, 100000) for _ in range(iterations_per_step)]
+            for run_stats in run_ensemble(current_config, 3000, seeds, self.n_jobs, keep_timeline=False):
+                run_metrics['avg_buffer'].append(run_stats.buffer_level_sum / run_stats.sample_count)
+                run_metrics['total_stall_time'].append(run_stats.total_stall_time)
+                # Рассинхрон уже хранится по модулю, среднее берётся из накопленной суммы
+                sync_count = len(run_stats.sync_errors)
+                run_metrics['avg_sync'].append(run_stats.sync_error_sum * 1000 / sync_count if sync_count else 0)
+                run_metrics['sync_count'].append(sync_count)
 
             step_summary = {
                 'value': val,